@@ -0,0 +1,139 @@
+import json
+import os
+
+
+class P2Quantile:
+    """Streaming estimate of a single quantile with the P² algorithm (Jain & Chlamtac).
+
+    Keeps five markers regardless of how many samples were seen, and can be
+    saved to and restored from a plain dict.
+    """
+
+    def __init__(self, p=0.5):
+        self.p = p
+        self.heights = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+        self.count = 0
+
+    def add(self, x):
+        self.count += 1
+        h = self.heights
+        if len(h) < 5:
+            h.append(x)
+            h.sort()
+            return
+
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= h[k + 1]:
+                k += 1
+
+        n = self.positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Move the three middle markers towards their desired positions
+        for i in range(1, 4):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not h[i - 1] < height < h[i + 1]:
+                    height = h[i] + d * (h[i + d] - h[i]) / (n[i + d] - n[i])
+                h[i] = height
+                n[i] += d
+
+    def _parabolic(self, i, d):
+        h, n = self.heights, self.positions
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+                (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i]) +
+                (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1]))
+
+    def value(self):
+        if not self.heights:
+            return None
+        if len(self.heights) < 5:
+            return self.heights[min(len(self.heights) - 1, int(self.p * len(self.heights)))]
+        return self.heights[2]
+
+    def to_dict(self):
+        return {"p": self.p, "heights": list(self.heights), "positions": list(self.positions),
+                "desired": list(self.desired), "count": self.count}
+
+    @classmethod
+    def from_dict(cls, data):
+        estimator = cls(data["p"])
+        estimator.heights = list(data["heights"])
+        estimator.positions = list(data["positions"])
+        estimator.desired = list(data["desired"])
+        estimator.count = data["count"]
+        return estimator
+
+
+class EarCalibration:
+    """Per-driver open-eye EAR baseline and the closed-eye threshold derived from it.
+
+    The median open-eye EAR is tracked with P², so the caller should only pass
+    frames with open eyes: every closed-eye sample shifts the median down. The
+    threshold is `ratio` times that median, clamped to
+    [`min_thresh`, `max_thresh`]. Until `min_samples` EAR values have been seen
+    for a driver, `threshold()` returns None and the caller keeps its default.
+    """
+
+    def __init__(self, ratio=0.75, min_samples=300, min_thresh=0.15, max_thresh=0.35):
+        self.ratio = ratio
+        self.min_samples = min_samples
+        self.min_thresh = min_thresh
+        self.max_thresh = max_thresh
+        self.median = P2Quantile(0.5)
+
+    def update(self, ear):
+        self.median.add(ear)
+
+    @property
+    def ready(self):
+        return self.median.count >= self.min_samples
+
+    def threshold(self):
+        if not self.ready:
+            return None
+        return min(self.max_thresh, max(self.min_thresh, self.ratio * self.median.value()))
+
+    def to_dict(self):
+        return {"median": self.median.to_dict(), "threshold": self.threshold()}
+
+    def load(self, data):
+        self.median = P2Quantile.from_dict(data["median"])
+
+
+def load_profiles(path):
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_profile(path, driver_id, calibration):
+    # Read-modify-write through a temporary file so a crash never leaves a truncated file
+    profiles = load_profiles(path)
+    profiles[driver_id] = calibration.to_dict()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(profiles, f, indent=2)
+    os.replace(tmp_path, path)
@@ -1,9 +1,28 @@
 # Application paths and constants
 APP_CONFIG = {
+    'video_source': 0,  # camera index or path to a video file
+    'replay_speed': 1.0,  # video files: multiple of their recorded frame rate (0 = as fast as possible)
     'predictor_path': '../predictor/shape_predictor_68_face_landmarks.dat',
     'left_eye_path': '../image/left-eye.jpg',
     'right_eye_path': '../image/right-eye.jpg',
     'alert_sound': '../sound/alert.mp3',
     'focus_sound': '../sound/focus.mp3',
     'break_sound': '../sound/break.mp3',
+    'metric_windows': (60, 300),  # seconds, for PERCLOS / blink / yawn statistics
+    'perclos_thresh': 0.15,
+    'landmark_interval': 1,  # run the shape predictor every N frames, optical flow in between
+    'timeline_samples': 9000,  # history length of the timeline chart (~5 min at 30 FPS)
+    'driver_id': '',  # default driver for the adaptive EAR threshold ('' disables it)
+    'profiles_path': '../profiles/ear_profiles.json',
+    'calibration_frames': 900,  # open-eye frames per session used to refine the driver's EAR baseline
+    'pipeline_workers': 0,  # >0: capture and detection in separate processes with N detector workers
+    # CPU budget, e.g. 'processing': {'cores': [2, 3], 'nice': -5}; empty dicts leave the OS defaults
+    'resources': {
+        'opencv_threads': None,  # cv2.setNumThreads; None keeps OpenCV's default pool
+        'gui': {},
+        'processing': {},
+        'capture': {},  # pipelined mode only
+        'detectors': {},  # pipelined mode only
+        'audio': {},  # libvlc playback threads
+    },
 }
\ No newline at end of file
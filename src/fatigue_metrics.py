@@ -0,0 +1,112 @@
+import numpy as np
+
+
+class SlidingWindowCounter:
+    """Sums of per-frame quantities over the last `window` seconds.
+
+    Time is split into a fixed ring of buckets, so memory is constant and each
+    `add` touches at most the buckets that expired since the previous call.
+    """
+
+    def __init__(self, window, n_fields, resolution=1.0):
+        self.window = float(window)
+        self.resolution = float(resolution)
+        self.n_buckets = max(1, int(np.ceil(self.window / self.resolution)))
+        self.buckets = np.zeros((self.n_buckets, n_fields))
+        self.totals = np.zeros(n_fields)
+        self.current = None  # absolute index of the newest bucket
+
+    def _advance(self, timestamp):
+        index = int(timestamp // self.resolution)
+        if self.current is None:
+            self.current = index
+        elif index > self.current:
+            expired = min(index - self.current, self.n_buckets)
+            for step in range(1, expired + 1):
+                slot = (self.current + step) % self.n_buckets
+                self.totals -= self.buckets[slot]
+                self.buckets[slot] = 0
+            self.current = index
+        return self.current % self.n_buckets
+
+    def add(self, timestamp, values):
+        slot = self._advance(timestamp)
+        self.buckets[slot] += values
+        self.totals += values
+
+    def sums(self, timestamp):
+        self._advance(timestamp)
+        return self.totals
+
+
+class FatigueMetrics:
+    """Incremental PERCLOS, blink rate, blink duration and yawn frequency.
+
+    Every call to `update` is O(1) in the number of frames seen; blinks and
+    yawns are recorded as events when they end, so only their running state
+    is kept between frames.
+    """
+
+    # Columns of each window's bucket array
+    FRAMES, CLOSED, BLINKS, BLINK_TIME, YAWNS = range(5)
+
+    def __init__(self, windows=(60, 300), max_blink_duration=0.5, resolution=1.0):
+        self.windows = tuple(windows)
+        self.max_blink_duration = max_blink_duration
+        self.resolution = resolution
+        self.reset()
+
+    def reset(self):
+        self.counters = {w: SlidingWindowCounter(w, 5, self.resolution) for w in self.windows}
+        self.closed_since = None
+        self.yawning = False
+        self.started = None
+        self.last_timestamp = None
+
+    def update(self, timestamp, eye_closed, yawning):
+        values = np.zeros(5)
+        values[self.FRAMES] = 1
+        values[self.CLOSED] = 1 if eye_closed else 0
+
+        if eye_closed and self.closed_since is None:
+            self.closed_since = timestamp
+        elif not eye_closed and self.closed_since is not None:
+            duration = timestamp - self.closed_since
+            # Longer closures are microsleeps; they still count towards PERCLOS
+            if duration <= self.max_blink_duration:
+                values[self.BLINKS] = 1
+                values[self.BLINK_TIME] = duration
+            self.closed_since = None
+
+        if yawning and not self.yawning:
+            values[self.YAWNS] = 1
+        self.yawning = yawning
+
+        for counter in self.counters.values():
+            counter.add(timestamp, values)
+        if self.started is None:
+            self.started = timestamp
+        self.last_timestamp = timestamp
+
+    def snapshot(self, timestamp=None):
+        """Return {window_seconds: {metric: value}} for all configured windows."""
+        if timestamp is None:
+            timestamp = self.last_timestamp
+        result = {}
+        for window, counter in self.counters.items():
+            if timestamp is None:
+                totals = np.zeros(5)
+            else:
+                totals = counter.sums(timestamp)
+            frames = totals[self.FRAMES]
+            blinks = totals[self.BLINKS]
+            # Rates are per minute of observed time until the window has filled
+            elapsed = 0.0 if self.started is None else timestamp - self.started
+            minutes = max(min(window, elapsed), self.resolution) / 60.0
+            result[window] = {
+                "perclos": float(totals[self.CLOSED] / frames) if frames else 0.0,
+                "blink_rate": float(blinks / minutes),
+                "blink_duration": float(totals[self.BLINK_TIME] / blinks) if blinks else 0.0,
+                "yawn_rate": float(totals[self.YAWNS] / minutes),
+            }
+        return result
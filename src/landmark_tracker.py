@@ -0,0 +1,128 @@
+import cv2
+import numpy as np
+from imutils import face_utils
+
+
+class LandmarkTracker:
+    """Runs the 68-point shape predictor every `interval` frames and tracks the
+    eye and mouth points with pyramidal Lucas-Kanade in between.
+
+    Points that are not tracked (nose, chin, jaw, brows) are moved by the mean
+    displacement of the tracked ones, which is enough for the head pose estimate.
+    The tracker re-anchors on the full predictor when the interval expires, when
+    the flow error grows past `max_flow_error`, when the tracked points leave the
+    detected face box, or when `reanchor()` is called
+    (e.g. on a blink, where eyelid motion breaks the brightness constancy LK needs).
+
+    At each scheduled re-anchor the tracked EAR is compared to the predictor EAR;
+    if the drift exceeds `ear_tolerance` the interval is halved, and it grows back
+    towards the configured value while the drift stays small.
+    """
+
+    def __init__(self, predictor, ear, interval=3, max_flow_error=12.0, ear_tolerance=0.03,
+                 roi_margin=15, win_size=(15, 15), max_level=2):
+        self.predictor = predictor
+        self.ear = ear
+        self.max_interval = max(1, int(interval))
+        self.interval = self.max_interval
+        self.max_flow_error = max_flow_error
+        self.ear_tolerance = ear_tolerance
+        self.roi_margin = roi_margin
+        self.lk_params = dict(winSize=win_size, maxLevel=max_level,
+                              criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+
+        (leStart, leEnd) = face_utils.FACIAL_LANDMARKS_IDXS["left_eye"]
+        (reStart, reEnd) = face_utils.FACIAL_LANDMARKS_IDXS["right_eye"]
+        (mStart, mEnd) = face_utils.FACIAL_LANDMARKS_IDXS["mouth"]
+        self.left_eye = np.arange(leStart, leEnd)
+        self.right_eye = np.arange(reStart, reEnd)
+        self.tracked = np.concatenate([self.left_eye, self.right_eye, np.arange(mStart, mEnd)])
+
+        # Statistics
+        self.full_runs = 0
+        self.tracked_frames = 0
+        self.last_ear_error = 0.0
+
+        self.reset()
+
+    def reset(self):
+        self.prev_gray = None
+        self.shape = None
+        self.since_anchor = 0
+        self.force = True
+
+    def reanchor(self):
+        self.force = True
+
+    def landmarks(self, gray, rect):
+        expired = not self.force and self.shape is not None and self.since_anchor + 1 >= self.interval
+        if self.force or self.shape is None or expired:
+            return self._anchor(gray, rect, scheduled=expired)
+
+        shape = self._track(gray)
+        if shape is None or not self._inside(shape, rect):
+            return self._anchor(gray, rect)
+
+        self.tracked_frames += 1
+        self.since_anchor += 1
+        self.shape = shape
+        self.prev_gray = gray
+        return np.rint(shape).astype(int)
+
+    def _anchor(self, gray, rect, scheduled=False):
+        shape = face_utils.shape_to_np(self.predictor(gray, rect))
+        # Only interval expiry measures tracking drift; after a flow failure or a blink the
+        # previous shape belongs to another eyelid state and the EAR gap is not drift
+        if scheduled:
+            self._adapt_interval(shape)
+
+        self.full_runs += 1
+        self.since_anchor = 0
+        self.force = False
+        # Kept in float between anchors so sub-pixel motion is not rounded away
+        self.shape = shape.astype(np.float32)
+        self.prev_gray = gray
+        return shape
+
+    def _track(self, gray):
+        if self.prev_gray is None or self.prev_gray.shape != gray.shape:
+            return None
+
+        points = self.shape[self.tracked]
+        h, w = gray.shape[:2]
+        x1, y1 = np.maximum(points.min(axis=0).astype(int) - self.roi_margin, 0)
+        x2, y2 = np.minimum(points.max(axis=0).astype(int) + self.roi_margin + 1, (w, h))
+        if x2 <= x1 or y2 <= y1:
+            return None
+
+        # Flow only over the eye/mouth bounding box instead of the whole frame
+        offset = np.array([x1, y1], dtype=np.float32)
+        prev_pts = (points - offset).reshape(-1, 1, 2)
+        next_pts, st, err = cv2.calcOpticalFlowPyrLK(
+            self.prev_gray[y1:y2, x1:x2], gray[y1:y2, x1:x2], prev_pts, None, **self.lk_params)
+        if next_pts is None or not st.all() or float(err.max()) > self.max_flow_error:
+            return None
+
+        moved = next_pts.reshape(-1, 2) + offset
+        shape = self.shape + (moved - points).mean(axis=0)
+        shape[self.tracked] = moved
+        return shape
+
+    def _inside(self, shape, rect, slack=0.1):
+        # Tracked points that leave the detected face box belong to a stale or different face
+        if rect is None:
+            return True
+        points = shape[self.tracked]
+        dx = slack * (rect.right() - rect.left())
+        dy = slack * (rect.bottom() - rect.top())
+        return bool(points[:, 0].min() >= rect.left() - dx and points[:, 0].max() <= rect.right() + dx and
+                    points[:, 1].min() >= rect.top() - dy and points[:, 1].max() <= rect.bottom() + dy)
+
+    def _adapt_interval(self, shape):
+        tracked_ear = (self.ear(self.shape[self.left_eye]) + self.ear(self.shape[self.right_eye])) / 2.0
+        full_ear = (self.ear(shape[self.left_eye]) + self.ear(shape[self.right_eye])) / 2.0
+        self.last_ear_error = abs(tracked_ear - full_ear)
+        if self.last_ear_error > self.ear_tolerance:
+            self.interval = max(1, self.interval // 2)
+        elif self.interval < self.max_interval:
+            self.interval += 1
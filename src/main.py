@@ -2,8 +2,12 @@ import sys
 from PyQt6.QtWidgets import QApplication
 from ui import DrowsinessDetectionUI
 from config import APP_CONFIG
+from resources import set_opencv_threads, apply_thread_settings
 
 def main():
+    # Threads created from here on (Qt, the video thread) start with the GUI settings
+    set_opencv_threads(APP_CONFIG['resources']['opencv_threads'])
+    apply_thread_settings(APP_CONFIG['resources']['gui'])
     app = QApplication(sys.argv)
     window = DrowsinessDetectionUI(APP_CONFIG)
     window.show()
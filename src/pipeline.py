@@ -0,0 +1,228 @@
+import heapq
+import multiprocessing as mp
+import queue
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import dlib
+import numpy as np
+from imutils import face_utils
+
+from resources import apply_thread_settings
+
+
+def dlib_landmarks(predictor_path):
+    # Default per-worker landmarker: dlib face detection + 68-point shape predictor
+    detector = dlib.get_frontal_face_detector()
+    predictor = dlib.shape_predictor(predictor_path)
+
+    def landmarks(gray):
+        rects = detector(gray, 0)
+        if len(rects):
+            return face_utils.shape_to_np(predictor(gray, rects[0]))
+        return None
+
+    return landmarks
+
+
+class ReplayPacer:
+    """Reads a video file at `speed` times its recorded frame rate.
+
+    Cameras deliver frames in real time by themselves, and speed 0 reads files as
+    fast as they decode. When processing falls behind, the next frame is not
+    hurried to catch up, so a stall never turns into a burst.
+    """
+
+    def __init__(self, capture, source, speed):
+        fps = capture.get(cv2.CAP_PROP_FPS) if isinstance(source, str) and speed else 0
+        self.period = 1.0 / (fps * speed) if fps > 0 else 0.0
+        self.next_frame = None
+
+    def wait(self):
+        if not self.period:
+            return
+        now = time.monotonic()
+        if self.next_frame is not None and self.next_frame > now:
+            time.sleep(self.next_frame - now)
+            now = self.next_frame
+        self.next_frame = now + self.period
+
+
+def _capture_loop(source, n_slots, free_slots, tasks, layout, stop_event, n_workers, settings, speed):
+    # Capture stage: copy each frame into a free shared-memory slot and hand the
+    # slot to the detector workers. Frames are dropped (not queued) when every slot
+    # is busy, so a slow consumer never makes the camera fall behind real time.
+    # The slots are sized from the first frame and announced once on `layout`.
+    apply_thread_settings(settings)
+    capture = cv2.VideoCapture(source)
+    pacer = ReplayPacer(capture, source, speed)
+    slots = []
+    index = 0
+    try:
+        while not stop_event.is_set():
+            ret, frame = capture.read()
+            if not ret:
+                if isinstance(source, str):
+                    capture.set(cv2.CAP_PROP_POS_FRAMES, 0)  # replay video files in a loop
+                continue
+            pacer.wait()
+            if not slots:
+                slots = [shared_memory.SharedMemory(create=True, size=frame.nbytes) for _ in range(n_slots)]
+                layout.put([slot.name for slot in slots])
+            if frame.nbytes > slots[0].size:
+                raise ValueError("Frame size changed from %d to %d bytes" % (slots[0].size, frame.nbytes))
+            try:
+                slot = free_slots.get_nowait()
+            except queue.Empty:
+                continue
+
+            view = np.ndarray(frame.shape, dtype=np.uint8, buffer=slots[slot].buf)
+            view[:] = frame
+            tasks.put((index, slot, slots[slot].name, frame.shape, time.monotonic()))
+            index += 1
+    finally:
+        capture.release()
+        for _ in range(n_workers):
+            tasks.put(None)
+        # The consumer owns the segments and unlinks them in FramePipeline.stop()
+        for slot in slots:
+            slot.close()
+
+
+def _detect_loop(landmarks_factory, predictor_path, tasks, results, settings):
+    # Detection stage: face detection and 68-point landmarks for one frame at a time.
+    # Consecutive frames go to different workers, so there is no optical-flow state here.
+    cv2.setNumThreads(1)  # parallelism comes from the worker processes
+    apply_thread_settings(settings)
+    landmarks = landmarks_factory(predictor_path)
+    attached = {}
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        index, slot, name, frame_shape, timestamp = task
+        shape = None
+        try:
+            if name not in attached:
+                attached[name] = shared_memory.SharedMemory(name=name)
+            frame = np.ndarray(frame_shape, dtype=np.uint8, buffer=attached[name].buf)
+            shape = landmarks(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+            del frame
+        finally:
+            # Always answer, otherwise the re-ordering in results() would stall
+            results.put((index, slot, frame_shape, timestamp, shape))
+
+    for segment in attached.values():
+        segment.close()
+    # Results left unread at shutdown must not block this process from exiting
+    results.cancel_join_thread()
+
+
+class FramePipeline:
+    """Capture, detection and alert logic split across processes.
+
+    One capture process writes frames into a ring of shared-memory slots, several
+    detector processes run face detection and landmarking on consecutive frames in
+    parallel, and `results()` yields them back in frame order to the consumer, which
+    runs the alert state machine and rendering.
+
+    `landmarks_factory(predictor_path)` is called once in each detector process and
+    returns a function mapping a grayscale frame to a (68, 2) shape or None; it must
+    be a module-level function so it can be sent to the spawned processes.
+    """
+
+    def __init__(self, predictor_path, workers=2, source=0, slots=None, resources=None,
+                 landmarks_factory=dlib_landmarks, replay_speed=1.0):
+        self.predictor_path = predictor_path
+        self.workers = max(1, int(workers))
+        self.source = source
+        self.replay_speed = replay_speed
+        self.n_slots = slots if slots is not None else 2 * self.workers + 2
+        self.resources = resources or {}
+        self.landmarks_factory = landmarks_factory
+        self.slots = []
+        self.processes = []
+
+    def start(self):
+        ctx = mp.get_context("spawn")
+        self.slots = []
+        self.free_slots = ctx.Queue()
+        for slot in range(self.n_slots):
+            self.free_slots.put(slot)
+        self.tasks = ctx.Queue()
+        self.results_queue = ctx.Queue()
+        self.layout = ctx.Queue()
+        self.stop_event = ctx.Event()
+
+        self.processes = [ctx.Process(target=_capture_loop, name='capture', daemon=True,
+                                      args=(self.source, self.n_slots, self.free_slots, self.tasks, self.layout,
+                                            self.stop_event, self.workers, self.resources.get('capture'),
+                                            self.replay_speed))]
+        for i in range(self.workers):
+            self.processes.append(ctx.Process(target=_detect_loop, name='detector-%d' % (i + 1), daemon=True,
+                                              args=(self.landmarks_factory, self.predictor_path, self.tasks,
+                                                    self.results_queue, self.resources.get('detectors'))))
+        for process in self.processes:
+            process.start()
+
+    def _attach(self, timeout=None):
+        # Slot names arrive from the capture process once it has seen the first frame
+        if not self.slots:
+            names = self.layout.get(timeout=timeout)
+            self.slots = [shared_memory.SharedMemory(name=name) for name in names]
+
+    def _check_processes(self):
+        for process in self.processes:
+            if process.exitcode is not None:
+                raise RuntimeError("Pipeline process '%s' exited with code %s" % (process.name, process.exitcode))
+
+    def results(self, running=lambda: True, timeout=0.1):
+        """Yield (index, frame, shape, timestamp) in capture order.
+
+        `frame` is a view into shared memory that is only valid until the next
+        iteration; the slot is handed back to the capture process afterwards.
+        Raises RuntimeError if a pipeline process dies.
+        """
+        pending = []
+        next_index = 0
+        while running():
+            if not pending or pending[0][0] != next_index:
+                try:
+                    heapq.heappush(pending, self.results_queue.get(timeout=timeout))
+                except queue.Empty:
+                    self._check_processes()
+                continue
+
+            # One frame per iteration, so running() is checked before every yield
+            index, slot, frame_shape, timestamp, shape = heapq.heappop(pending)
+            self._attach()
+            frame = np.ndarray(frame_shape, dtype=np.uint8, buffer=self.slots[slot].buf)
+            try:
+                yield index, frame, shape, timestamp
+            finally:
+                del frame
+                self.free_slots.put(slot)
+            next_index += 1
+
+    def stop(self):
+        if not self.processes:
+            return
+        self.stop_event.set()
+        for process in self.processes:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        try:
+            self._attach(timeout=0.5)
+        except queue.Empty:
+            pass  # no frame was ever captured, so no slots were created
+        for slot in self.slots:
+            slot.unlink()
+            try:
+                slot.close()
+            except BufferError:
+                pass  # a consumer still holds a view; the mapping goes away with it
+        self.slots = []
@@ -0,0 +1,211 @@
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+import cv2
+
+# Thread settings are dicts such as {'cores': [2, 3], 'nice': -5}. Both keys are
+# optional. Pinning and priorities use Linux per-thread semantics and are skipped
+# where the platform does not support them.
+HAS_AFFINITY = hasattr(os, 'sched_setaffinity')
+HAS_PRIORITY = hasattr(os, 'setpriority')
+TASK_DIR = '/proc/self/task'
+
+logger = logging.getLogger(__name__)
+
+
+def set_opencv_threads(count):
+    if count is not None:
+        cv2.setNumThreads(int(count))
+
+
+def apply_thread_settings(settings):
+    """Pin the calling thread to settings['cores'] and set its nice value.
+
+    Returns False and logs a warning if any part was refused (e.g. negative nice
+    without CAP_SYS_NICE); the effective values are visible in ResourceMonitor samples.
+    """
+    if not settings:
+        return True
+    applied = True
+    tid = threading.get_native_id()
+    if settings.get('cores') and HAS_AFFINITY:
+        try:
+            os.sched_setaffinity(0, settings['cores'])
+        except OSError as e:
+            logger.warning("Could not pin thread %d to cores %s: %s", tid, settings['cores'], e)
+            applied = False
+    if settings.get('nice') is not None and HAS_PRIORITY:
+        if not set_thread_nice(tid, settings['nice']):
+            logger.warning("Could not set nice %d on thread %d", settings['nice'], tid)
+            applied = False
+    return applied
+
+
+def set_thread_nice(tid, nice):
+    try:
+        # On Linux the nice value belongs to the thread, not the whole process
+        os.setpriority(os.PRIO_PROCESS, tid, nice)
+    except OSError:
+        return False
+    return True
+
+
+def thread_ids():
+    # Native ids of all threads of this process, or an empty set where /proc is missing
+    try:
+        return {int(tid) for tid in os.listdir(TASK_DIR)}
+    except OSError:
+        return set()
+
+
+@contextmanager
+def thread_settings(settings):
+    """Steer the threads a library creates inside the block (libvlc playback).
+
+    New threads inherit the creator's affinity, so the cores are applied to the
+    calling thread temporarily and restored afterwards. Nice is not applied that
+    way, since an unprivileged thread cannot lower its nice value back: it is set
+    on the threads that appeared during the block instead, and the threads they
+    start later inherit it.
+    """
+    if not settings:
+        yield
+        return
+    cores = settings.get('cores') if HAS_AFFINITY else None
+    nice = settings.get('nice') if HAS_PRIORITY else None
+    before_cores = os.sched_getaffinity(0) if cores else None
+    before_threads = thread_ids() if nice is not None else set()
+    if cores:
+        try:
+            os.sched_setaffinity(0, cores)
+        except OSError:
+            cores = None
+    try:
+        yield
+    finally:
+        if cores:
+            try:
+                os.sched_setaffinity(0, before_cores)
+            except OSError:
+                logger.warning("Could not restore the affinity of thread %d to %s",
+                               threading.get_native_id(), sorted(before_cores))
+        if nice is not None:
+            for tid in thread_ids() - before_threads:
+                if not set_thread_nice(tid, nice):
+                    logger.warning("Could not set nice %d on thread %d", nice, tid)
+
+
+def read_proc_stat(path):
+    # Returns (cpu seconds, nice) from a /proc/.../stat file, or None if it is gone
+    try:
+        with open(path) as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+    except (OSError, IndexError):
+        return None
+    ticks = int(fields[11]) + int(fields[12])  # utime + stime
+    return ticks / os.sysconf('SC_CLK_TCK'), int(fields[16])
+
+
+def read_comm(tid):
+    # Thread name as set by the library that created it (pthread_setname_np)
+    try:
+        with open('%s/%d/comm' % (TASK_DIR, tid)) as f:
+            return f.read().strip()
+    except OSError:
+        return 'thread'
+
+
+class ResourceMonitor:
+    """Per-thread / per-process CPU usage and frame-time statistics.
+
+    `sample()` reports, for every thread of this process and every registered
+    process, the fraction of one core it used since the previous sample together
+    with its effective core set and nice value, plus the mean and standard
+    deviation of the frame interval recorded with `frame()`. Registered threads
+    are reported under their role name; the rest (libvlc audio, OpenCV workers,
+    Qt internals) as "<comm>-<tid>".
+    """
+
+    def __init__(self):
+        self.entries = {}  # name -> [stat path, affinity id, last cpu seconds]
+        self.roles = {}  # native thread id -> registered name
+        self.task_cpu = {}  # native thread id -> last cpu seconds, for unregistered threads
+        self.last_sample = None
+        self.last_frame = None
+        self.frame_sum = 0.0
+        self.frame_sq_sum = 0.0
+        self.frame_count = 0
+        self.report = {}
+
+    def register_thread(self, name, tid=None):
+        tid = threading.get_native_id() if tid is None else tid
+        self.roles[tid] = name
+        self._register(name, '%s/%d/stat' % (TASK_DIR, tid), tid)
+
+    def register_process(self, name, pid):
+        self._register(name, '/proc/%d/stat' % pid, pid)
+
+    def _register(self, name, path, affinity_id):
+        stat = read_proc_stat(path)
+        self.entries[name] = [path, affinity_id, stat[0] if stat else 0.0]
+
+    def unregister(self, name):
+        entry = self.entries.pop(name, None)
+        if entry and self.roles.get(entry[1]) == name:
+            del self.roles[entry[1]]
+
+    def frame(self, now):
+        if self.last_frame is not None:
+            interval = now - self.last_frame
+            self.frame_sum += interval
+            self.frame_sq_sum += interval * interval
+            self.frame_count += 1
+        self.last_frame = now
+
+    def sample(self, now):
+        elapsed = None if self.last_sample is None else now - self.last_sample
+        self.last_sample = now
+        threads = {}
+        for name, entry in self.entries.items():
+            path, affinity_id, last_cpu = entry
+            stat = read_proc_stat(path)
+            if stat is None:
+                continue
+            entry[2] = stat[0]
+            threads[name] = self._usage(stat, last_cpu, elapsed, affinity_id)
+
+        task_cpu = {}
+        for tid in thread_ids() - set(self.roles):
+            stat = read_proc_stat('%s/%d/stat' % (TASK_DIR, tid))
+            if stat is None:
+                continue  # exited since the directory was listed
+            task_cpu[tid] = stat[0]
+            # A thread first seen now started after the previous sample
+            threads['%s-%d' % (read_comm(tid), tid)] = self._usage(stat, self.task_cpu.get(tid, 0.0), elapsed, tid)
+        self.task_cpu = task_cpu
+
+        mean = self.frame_sum / self.frame_count if self.frame_count else 0.0
+        variance = self.frame_sq_sum / self.frame_count - mean * mean if self.frame_count else 0.0
+        self.report = {
+            "threads": threads,
+            "frame_ms": 1000.0 * mean,
+            "jitter_ms": 1000.0 * max(variance, 0.0) ** 0.5,
+        }
+        self.frame_sum = self.frame_sq_sum = 0.0
+        self.frame_count = 0
+        return self.report
+
+    @staticmethod
+    def _usage(stat, last_cpu, elapsed, affinity_id):
+        cpu, nice = stat
+        try:
+            cores = sorted(os.sched_getaffinity(affinity_id)) if HAS_AFFINITY else []
+        except OSError:
+            cores = []
+        return {
+            "cpu": (cpu - last_cpu) / elapsed if elapsed else 0.0,
+            "cores": cores,
+            "nice": nice,
+        }
@@ -0,0 +1,199 @@
+import argparse
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+
+def current_rss_mb():
+    # Linux: current resident set size from /proc, otherwise the peak from getrusage
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def current_thread_count():
+    # OS-level threads include Qt, libvlc and OpenCV workers, not only Python threads
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('Threads:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return threading.active_count()
+
+
+class SoakMonitor:
+    """Collects per-interval resource samples and checks them against drift limits.
+
+    Latency is accumulated as sum/count/max per interval, so memory stays bounded
+    by the number of samples rather than the number of frames. The first sample
+    after `warmup` seconds is the baseline every later sample is compared to.
+    """
+
+    def __init__(self, max_rss_growth_mb=50.0, max_latency_drift_ms=20.0, max_thread_growth=4,
+                 warmup=60.0, top_allocators=10, trace=True):
+        self.max_rss_growth_mb = max_rss_growth_mb
+        self.max_latency_drift_ms = max_latency_drift_ms
+        self.max_thread_growth = max_thread_growth
+        self.warmup = warmup
+        self.top_allocators = top_allocators
+        self.trace = trace
+
+        self.started = None
+        self.baseline = None
+        self.baseline_snapshot = None
+        self.samples = []
+        self.reset_interval()
+
+    def reset_interval(self):
+        self.latency_sum = 0.0
+        self.latency_count = 0
+        self.latency_max = 0.0
+
+    def start(self, now=None):
+        self.started = time.monotonic() if now is None else now
+        if self.trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def record_latency(self, latency):
+        self.latency_sum += latency
+        self.latency_count += 1
+        self.latency_max = max(self.latency_max, latency)
+
+    def sample(self, rss_mb=None, threads=None, now=None):
+        now = time.monotonic() if now is None else now
+        sample = {
+            "elapsed": now - self.started,
+            "rss_mb": current_rss_mb() if rss_mb is None else rss_mb,
+            "threads": current_thread_count() if threads is None else threads,
+            "frames": self.latency_count,
+            "latency_ms": 1000.0 * self.latency_sum / self.latency_count if self.latency_count else 0.0,
+            "latency_max_ms": 1000.0 * self.latency_max,
+            "top_allocators": [],
+        }
+        self.reset_interval()
+
+        snapshot = tracemalloc.take_snapshot() if self.trace and tracemalloc.is_tracing() else None
+        if snapshot is not None and self.baseline_snapshot is not None:
+            stats = snapshot.compare_to(self.baseline_snapshot, 'lineno')[:self.top_allocators]
+            sample["top_allocators"] = [str(stat) for stat in stats]
+
+        if self.baseline is None and sample["elapsed"] >= self.warmup and sample["frames"]:
+            self.baseline = sample
+            self.baseline_snapshot = snapshot
+        self.samples.append(sample)
+        return sample
+
+    def failures(self):
+        if self.baseline is None or not self.samples:
+            return []
+        last = self.samples[-1]
+        problems = []
+        rss_growth = last["rss_mb"] - self.baseline["rss_mb"]
+        if rss_growth > self.max_rss_growth_mb:
+            problems.append("RSS grew by %.1f MB (limit %.1f MB)" % (rss_growth, self.max_rss_growth_mb))
+        thread_growth = last["threads"] - self.baseline["threads"]
+        if thread_growth > self.max_thread_growth:
+            problems.append("Thread count grew by %d (limit %d)" % (thread_growth, self.max_thread_growth))
+        if last["frames"]:
+            drift = last["latency_ms"] - self.baseline["latency_ms"]
+            if drift > self.max_latency_drift_ms:
+                problems.append("Mean frame latency drifted by %.1f ms (limit %.1f ms)" %
+                                (drift, self.max_latency_drift_ms))
+        return problems
+
+    def report(self, sample):
+        line = "[%8.0fs] rss=%.1fMB threads=%d frames=%d latency=%.1fms max=%.1fms" % (
+            sample["elapsed"], sample["rss_mb"], sample["threads"], sample["frames"],
+            sample["latency_ms"], sample["latency_max_ms"])
+        return "\n".join([line] + ["    " + stat for stat in sample["top_allocators"]])
+
+
+def run_soak(args):
+    # Imported here so SoakMonitor can be used without the Qt/dlib stack
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QTimer
+    from ui import DrowsinessDetectionUI
+    from config import APP_CONFIG
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    # Paced replay: an unpaced source outruns the GUI thread and the queued frame
+    # signals would grow without bound, which is the harness leaking, not the app
+    config = dict(APP_CONFIG, video_source=os.path.abspath(args.video), replay_speed=args.speed)
+    window = DrowsinessDetectionUI(config)
+    window.show()
+
+    monitor = SoakMonitor(args.max_rss_growth, args.max_latency_drift, args.max_thread_growth,
+                          warmup=args.warmup, top_allocators=args.top, trace=not args.no_tracemalloc)
+    result = {"code": 0}
+
+    def on_status(status):
+        monitor.record_latency(time.monotonic() - status["timestamp"])
+
+    def start():
+        window.start_video()
+        window.video_thread.update_status.connect(on_status)
+
+    def restart():
+        window.stop_video()
+        start()
+
+    def sample():
+        print(monitor.report(monitor.sample()), flush=True)
+        problems = monitor.failures()
+        if problems:
+            for problem in problems:
+                print("SOAK FAILURE: " + problem, flush=True)
+            result["code"] = 1
+            finish()
+        elif monitor.samples[-1]["elapsed"] >= args.duration:
+            finish()
+
+    def finish():
+        window.stop_video()
+        app.exit(result["code"])
+
+    monitor.start()
+    start()
+
+    sample_timer = QTimer()
+    sample_timer.timeout.connect(sample)
+    sample_timer.start(int(args.interval * 1000))
+    if args.restart_every:
+        restart_timer = QTimer()
+        restart_timer.timeout.connect(restart)
+        restart_timer.start(int(args.restart_every * 1000))
+
+    return app.exec()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a video through the UI and processor for hours "
+                                                 "and fail on memory, thread or latency drift.")
+    parser.add_argument('video', help="video file replayed in a loop")
+    parser.add_argument('--speed', type=float, default=1.0,
+                        help="replay speed as a multiple of the video frame rate (0 = as fast as it decodes)")
+    parser.add_argument('--duration', type=float, default=12 * 3600, help="seconds to run")
+    parser.add_argument('--interval', type=float, default=60, help="seconds between samples")
+    parser.add_argument('--warmup', type=float, default=120, help="seconds before the baseline sample")
+    parser.add_argument('--restart-every', type=float, default=600,
+                        help="seconds between stop/start cycles (0 disables)")
+    parser.add_argument('--max-rss-growth', type=float, default=50.0, help="MB above the baseline")
+    parser.add_argument('--max-latency-drift', type=float, default=20.0, help="ms above the baseline mean")
+    parser.add_argument('--max-thread-growth', type=int, default=4, help="threads above the baseline")
+    parser.add_argument('--top', type=int, default=10, help="tracemalloc allocators to print per sample")
+    parser.add_argument('--no-tracemalloc', action='store_true', help="disable tracemalloc (lower overhead)")
+    sys.exit(run_soak(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
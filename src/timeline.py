@@ -0,0 +1,191 @@
+import numpy as np
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtGui import QPainter, QPen, QColor, QPolygonF
+from PyQt6.QtCore import Qt, QTimer
+
+
+class RingBuffer:
+    """Fixed-size history of per-frame samples with one column per channel."""
+
+    def __init__(self, capacity, channels):
+        self.data = np.zeros((capacity, channels), dtype=np.float32)
+        self.capacity = capacity
+        self.head = 0  # next write position
+        self.count = 0
+        self.total = 0  # samples appended since the last clear; sample i lives at data[i % capacity]
+
+    def append(self, values):
+        self.data[self.head] = values
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.total += 1
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+        self.total = 0
+
+    def ordered(self):
+        # Oldest sample first
+        if self.count < self.capacity:
+            return self.data[:self.count]
+        return np.concatenate((self.data[self.head:], self.data[:self.head]))
+
+
+class ColumnMinMax:
+    """Per-pixel-column min and max of a RingBuffer, kept up to date on every append.
+
+    Column k covers samples [k * per_column, (k + 1) * per_column) by their index since
+    the last clear, so an append touches a single column and reading the columns costs
+    O(width + per_column) however many samples are stored. Keeping both extremes of
+    every column preserves short spikes such as blinks that plain subsampling would drop.
+    """
+
+    def __init__(self, buffer, width):
+        self.buffer = buffer
+        self.rebuild(width)
+
+    def rebuild(self, width):
+        # Called when the pixel width changes; the only O(history) operation
+        self.width = width
+        self.per_column = -(-self.buffer.capacity // max(1, width))
+        self.slots = -(-self.buffer.capacity // self.per_column) + 1
+        channels = self.buffer.data.shape[1]
+        self.lows = np.zeros((self.slots, channels), dtype=np.float32)
+        self.highs = np.zeros((self.slots, channels), dtype=np.float32)
+
+        values = self.buffer.ordered()
+        if len(values):
+            columns = np.arange(self.buffer.total - len(values), self.buffer.total) // self.per_column
+            starts = np.flatnonzero(np.diff(columns, prepend=-1))
+            slots = columns[starts] % self.slots
+            self.lows[slots] = np.minimum.reduceat(values, starts, axis=0)
+            self.highs[slots] = np.maximum.reduceat(values, starts, axis=0)
+
+    def append(self, values):
+        # Call after the sample was appended to the buffer
+        index = self.buffer.total - 1
+        slot = (index // self.per_column) % self.slots
+        if index % self.per_column == 0:
+            self.lows[slot] = self.highs[slot] = values
+        else:
+            np.minimum(self.lows[slot], values, out=self.lows[slot])
+            np.maximum(self.highs[slot], values, out=self.highs[slot])
+
+    def columns(self):
+        """Return (offsets, lows, highs) for the stored samples, oldest column first.
+
+        `offsets` is the position of each column's first sample counted from the
+        oldest sample still in the buffer.
+        """
+        total, count = self.buffer.total, self.buffer.count
+        first = total - count
+        columns = np.arange(first // self.per_column, (total - 1) // self.per_column + 1 if count else 0)
+        lows = self.lows[columns % self.slots]
+        highs = self.highs[columns % self.slots]
+
+        # The oldest column may still include samples that already left the buffer
+        if count and first % self.per_column:
+            end = min((columns[0] + 1) * self.per_column, total)
+            part = self.buffer.data[np.arange(first, end) % self.buffer.capacity]
+            lows[0] = part.min(axis=0)
+            highs[0] = part.max(axis=0)
+
+        return np.maximum(columns * self.per_column, first) - first, lows, highs
+
+
+def polygon_array(polygon):
+    # (n, 2) float64 view of the polygon's points, filled without creating a QPointF per point
+    pointer = polygon.data()
+    pointer.setsize(len(polygon) * 2 * np.dtype(np.float64).itemsize)
+    return np.frombuffer(pointer, dtype=np.float64).reshape(-1, 2)
+
+
+class TimelineChart(QWidget):
+    """Scrolling chart of EAR, mouth ratio and alert level.
+
+    Samples go into the ring buffer and update one min/max column; repainting is
+    driven by a timer at `fps` and draws two points per pixel column, so its cost
+    depends on the widget width rather than the history length or the camera frame
+    rate. The columns are rebuilt from the whole history only when the width changes.
+    """
+
+    # (label, color, value range)
+    CHANNELS = [
+        ("EAR", QColor("#2ecc71"), (0.0, 0.5)),
+        ("Рот", QColor("#f39c12"), (0.0, 1.0)),
+        ("Тривога", QColor("#e74c3c"), (0.0, 3.0)),
+    ]
+
+    def __init__(self, capacity=9000, fps=10, parent=None):
+        super().__init__(parent)
+        self.buffer = RingBuffer(capacity, len(self.CHANNELS))
+        self.columns = ColumnMinMax(self.buffer, self.width())
+        self.polygons = [QPolygonF() for _ in self.CHANNELS]
+        self.threshold = None
+        self.dirty = False
+        self.setMinimumHeight(120)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(int(1000 / fps))
+
+    def append(self, ear, mouth_ratio, alert_level):
+        self.buffer.append((ear, mouth_ratio, alert_level))
+        self.columns.append((ear, mouth_ratio, alert_level))
+        self.dirty = True
+
+    def clear(self):
+        self.buffer.clear()
+        self.dirty = True
+
+    def set_threshold(self, ear):
+        self.threshold = ear
+        self.dirty = True
+
+    def refresh(self):
+        if self.dirty:
+            self.dirty = False
+            self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#34495e"))
+        w, h = self.width(), self.height()
+
+        if self.threshold is not None:
+            y = h - 1 - self.threshold / self.CHANNELS[0][2][1] * (h - 1)
+            painter.setPen(QPen(QColor("#7f8c8d"), 1, Qt.PenStyle.DashLine))
+            painter.drawLine(0, int(y), w, int(y))
+
+        n = self.buffer.count
+        if n and w > 1:
+            if self.columns.width != w:
+                self.columns.rebuild(w)
+            offsets, lows, highs = self.columns.columns()
+            # The full buffer spans the widget width, newest sample at the right edge
+            step = (w - 1) / max(self.buffer.capacity - 1, 1)
+            xs = (w - 1) - (n - 1 - offsets) * step
+
+            for channel, (_, color, (low, high)) in enumerate(self.CHANNELS):
+                scale = (h - 1) / (high - low)
+                y_high = np.clip(h - 1 - (highs[:, channel] - low) * scale, 0, h - 1)
+                y_low = np.clip(h - 1 - (lows[:, channel] - low) * scale, 0, h - 1)
+                # Each column contributes its max then its min point
+                polygon = self.polygons[channel]
+                polygon.resize(2 * len(xs))
+                points = polygon_array(polygon)
+                points[0::2, 0] = points[1::2, 0] = xs
+                points[0::2, 1] = y_high
+                points[1::2, 1] = y_low
+                painter.setPen(QPen(color, 1))
+                painter.drawPolyline(polygon)
+
+        # Legend
+        x = 5
+        for label, color, _ in self.CHANNELS:
+            painter.setPen(color)
+            painter.drawText(x, 12, label)
+            x += painter.fontMetrics().horizontalAdvance(label) + 10
+
+        painter.end()
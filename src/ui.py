@@ -1,9 +1,10 @@
 from PyQt6.QtWidgets import (QMainWindow, QLabel, QVBoxLayout,
-                            QHBoxLayout, QWidget, QPushButton, QProgressBar)
+                            QHBoxLayout, QWidget, QPushButton, QProgressBar, QLineEdit)
 from PyQt6.QtGui import QImage, QPixmap, QFont
 from PyQt6.QtCore import Qt
 import cv2
 from video_processor import VideoProcessor
+from timeline import TimelineChart
 
 class DrowsinessDetectionUI(QMainWindow):
     def __init__(self, config):
@@ -99,6 +100,11 @@ class DrowsinessDetectionUI(QMainWindow):
         self.yawn_status.setFont(QFont("Arial", 12))
         self.yawn_status.setStyleSheet("color: #2ecc71;")
 
+        # EAR / mouth ratio / alert level history
+        timeline_label = QLabel("Історія:")
+        timeline_label.setStyleSheet("color: #ecf0f1;")
+        self.timeline = TimelineChart(self.config['timeline_samples'])
+
         # Add widgets to status layout
         status_layout.addWidget(status_title)
         status_layout.addWidget(self.status_label)
@@ -108,6 +114,19 @@ class DrowsinessDetectionUI(QMainWindow):
         status_layout.addWidget(self.eye_status)
         status_layout.addWidget(yawn_label)
         status_layout.addWidget(self.yawn_status)
+        status_layout.addWidget(timeline_label)
+        status_layout.addWidget(self.timeline)
+
+        # Driver profile for the adaptive EAR threshold
+        driver_layout = QHBoxLayout()
+        driver_label = QLabel("Водій:")
+        driver_label.setStyleSheet("color: #ecf0f1;")
+        self.driver_input = QLineEdit(self.config['driver_id'])
+        self.driver_input.setPlaceholderText("без калібрування")
+        self.driver_input.setStyleSheet(
+            "color: #ecf0f1; background-color: #34495e; border: 1px solid #7f8c8d; border-radius: 5px; padding: 5px;")
+        driver_layout.addWidget(driver_label)
+        driver_layout.addWidget(self.driver_input)
 
         # Buttons
         button_layout = QHBoxLayout()
@@ -149,6 +168,7 @@ class DrowsinessDetectionUI(QMainWindow):
         right_panel.addWidget(title_label)
         right_panel.addWidget(status_box)
         right_panel.addStretch(1)
+        right_panel.addLayout(driver_layout)
         right_panel.addLayout(button_layout)
 
         # Add panels to main layout
@@ -175,7 +195,17 @@ class DrowsinessDetectionUI(QMainWindow):
                     'alert': self.config['alert_sound'],
                     'focus': self.config['focus_sound'],
                     'break': self.config['break_sound']
-                }
+                },
+                metric_windows=self.config['metric_windows'],
+                perclos_thresh=self.config['perclos_thresh'],
+                landmark_interval=self.config['landmark_interval'],
+                pipeline_workers=self.config['pipeline_workers'],
+                source=self.config['video_source'],
+                driver_id=self.driver_input.text().strip() or None,
+                profiles_path=self.config['profiles_path'],
+                calibration_frames=self.config['calibration_frames'],
+                resources=self.config['resources'],
+                replay_speed=self.config['replay_speed']
             )
 
         self.video_thread.update_frame.connect(self.update_frame)
@@ -186,6 +216,7 @@ class DrowsinessDetectionUI(QMainWindow):
         if self.overlay_label:
             self.overlay_label.setVisible(False)
 
+        self.driver_input.setEnabled(False)
         self.start_button.setEnabled(False)
         self.stop_button.setEnabled(True)
 
@@ -208,7 +239,9 @@ class DrowsinessDetectionUI(QMainWindow):
         self.alertness_bar.setValue(0)
         self.eye_status.setText("Невідомо")
         self.yawn_status.setText("Невідомо")
+        self.timeline.clear()
 
+        self.driver_input.setEnabled(True)
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
 
@@ -235,6 +268,8 @@ class DrowsinessDetectionUI(QMainWindow):
         ear_value = status["ear"]
         alertness = min(100, max(0, int((ear_value - 0.15) * 200)))
         self.alertness_bar.setValue(alertness)
+        self.timeline.append(ear_value, status.get("yawn_ratio", 0.0), status["alert_level"])
+        self.timeline.set_threshold(self.video_thread.close_thresh)
 
         # Update color based on alert level
         if status["alert_level"] == 0:
@@ -1,19 +1,31 @@
 import cv2
 import math
+import time
 import numpy as np
 import dlib
 from imutils import face_utils
 import vlc
 from PyQt6.QtCore import QThread, pyqtSignal
+from fatigue_metrics import FatigueMetrics
+from landmark_tracker import LandmarkTracker
+from pipeline import FramePipeline, ReplayPacer
+from calibration import EarCalibration, load_profiles, save_profile
+from resources import ResourceMonitor, apply_thread_settings, thread_settings
 
 
 class VideoProcessor(QThread):
     update_frame = pyqtSignal(np.ndarray)
     update_status = pyqtSignal(dict)
 
-    def __init__(self, predictor_path, sound_paths):
+    def __init__(self, predictor_path, sound_paths, metric_windows=(60, 300), perclos_thresh=0.15,
+                 landmark_interval=1, pipeline_workers=0, source=0, driver_id=None, profiles_path=None,
+                 calibration_frames=900, resources=None, replay_speed=1.0):
         super().__init__()
         self.running = True
+        self.source = source  # camera index, or a video file path which is replayed in a loop
+        self.replay_speed = replay_speed  # video files: multiple of their frame rate, 0 = unpaced
+        self.predictor_path = predictor_path
+        self.pipeline_workers = pipeline_workers
 
         # Paths
         self.eye_images = {
@@ -34,6 +46,8 @@ class VideoProcessor(QThread):
         (self.leStart, self.leEnd) = face_utils.FACIAL_LANDMARKS_IDXS["left_eye"]
         (self.reStart, self.reEnd) = face_utils.FACIAL_LANDMARKS_IDXS["right_eye"]
         (self.mStart, self.mEnd) = face_utils.FACIAL_LANDMARKS_IDXS["mouth"]
+        # landmark_interval=1 runs the full predictor on every frame
+        self.tracker = LandmarkTracker(self.predictor, self.ear, interval=landmark_interval)
 
         # Drowsiness detection parameters
         self.alert = self.sounds['focus']
@@ -47,105 +61,231 @@ class VideoProcessor(QThread):
         self.map_flag = 1
         self.avgEAR = 0
 
+        # Sliding-window fatigue analytics (PERCLOS, blink rate, yawns)
+        self.metrics = FatigueMetrics(metric_windows)
+        self.perclos_window = min(metric_windows)
+        self.perclos_thresh = perclos_thresh
+
+        # Core pinning / priorities per thread role and CPU usage reporting.
+        # Constructed in the GUI thread, so that is the thread registered as 'gui'.
+        self.resources = resources or {}
+        self.resource_monitor = ResourceMonitor()
+        self.resource_monitor.register_thread('gui')
+        self.resource_interval = 1.0
+        self.next_resource_sample = 0
+
+        # Per-driver adaptive EAR threshold; driver_id=None keeps the fixed close_thresh
+        self.driver_id = driver_id
+        self.profiles_path = profiles_path
+        self.calibration_frames = calibration_frames
+        self.calibrated_frames = 0
+        self.calibration = EarCalibration()
+        if driver_id is not None:
+            profile = load_profiles(profiles_path).get(driver_id)
+            if profile:
+                self.calibration.load(profile)
+                self.applyCalibration()
+
     def run(self):
-        capture = cv2.VideoCapture(0)
         self.running = True
+        self.metrics.reset()
+        self.tracker.reset()
+        # In the single-threaded mode capture also happens on this thread
+        apply_thread_settings(self.resources.get('processing'))
+        self.resource_monitor.register_thread('processing')
+        if self.pipeline_workers:
+            self.runPipelined()
+            return
+
+        capture = cv2.VideoCapture(self.source)
+        pacer = ReplayPacer(capture, self.source, self.replay_speed)
 
         while self.running:
             ret, frame = capture.read()
             if not ret:
+                if isinstance(self.source, str):
+                    capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
                 continue
 
-            size = frame.shape
+            pacer.wait()
+            now = time.monotonic()
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            color_frame = frame.copy()
-
             rects = self.detector(gray, 0)
-            status = {
-                "alert_level": 0,  # 0: normal, 1: mild, 2: moderate, 3: severe
-                "ear": 0,
-                "yawning": False,
-                "message": "Normal"
-            }
-
             if len(rects):
-                shape = face_utils.shape_to_np(self.predictor(gray, rects[0]))
-                leftEye = shape[self.leStart:self.leEnd]
-                rightEye = shape[self.reStart:self.reEnd]
-                leftEyeHull = cv2.convexHull(leftEye)
-                rightEyeHull = cv2.convexHull(rightEye)
-                mouth = shape[self.mStart:self.mEnd]
-                mouthHull = cv2.convexHull(mouth)
-
-                leftEAR = self.ear(leftEye)
-                rightEAR = self.ear(rightEye)
-                self.avgEAR = (leftEAR + rightEAR) / 2.0
-                status["ear"] = self.avgEAR
-
-                eyeContourColor = (0, 255, 0)  # Default: green
-
-                yawn_ratio = self.yawn(mouth)
-                if yawn_ratio > 0.6:
-                    status["yawning"] = True
-                    self.yawn_countdown = 1
-                    cv2.drawContours(color_frame, [mouthHull], -1, (0, 0, 255), 2)
-                else:
-                    cv2.drawContours(color_frame, [mouthHull], -1, (0, 255, 0), 1)
-
-                if self.avgEAR < self.close_thresh:
-                    self.flag += 1
-
-                    if self.yawn_countdown and self.flag >= self.frame_thresh_3:
-                        eyeContourColor = (147, 20, 255)  # Purple
-                        status["alert_level"] = 3
-                        status["message"] = "Сонність (позіхання)"
-                        self.alert.play()
-                        if self.map_flag:
-                            self.map_flag = 0
-                            self.map_counter += 1
-                    elif self.flag >= self.frame_thresh_2 and self.getFaceDirection(shape, size) < 0:
-                        eyeContourColor = (255, 0, 0)  # Blue
-                        status["alert_level"] = 2
-                        status["message"] = "Сонність"
-                        self.alert.play()
-                        if self.map_flag:
-                            self.map_flag = 0
-                            self.map_counter += 1
-                    elif self.flag >= self.frame_thresh_1:
-                        eyeContourColor = (0, 0, 255)  # Red
-                        status["alert_level"] = 1
-                        status["message"] = "Сонність (закриті очі)"
-                        self.alert.play()
-                        if self.map_flag:
-                            self.map_flag = 0
-                            self.map_counter += 1
-                elif self.avgEAR > self.close_thresh and self.flag:
-                    self.alert.stop()
-                    self.yawn_countdown = 0
-                    self.map_flag = 1
-                    self.flag = 0
-
-                if self.map_counter >= 3:
-                    self.map_flag = 1
-                    self.map_counter = 0
-                    self.sounds['break'].play()
-                    status["message"] = "TAKE A BREAK NOW"
-
-                cv2.drawContours(color_frame, [leftEyeHull], -1, eyeContourColor, 2)
-                cv2.drawContours(color_frame, [rightEyeHull], -1, eyeContourColor, 2)
-                self.writeEyes(leftEye, rightEye, frame)
-
-            if self.avgEAR > self.close_thresh:
+                shape = self.tracker.landmarks(gray, rects[0])
+            else:
+                # Flow from the last frame with a face would be stale once it reappears
+                self.tracker.reset()
+                shape = None
+            self.processFrame(frame, shape, now)
+
+    def runPipelined(self):
+        # Capture and detection run in worker processes; results arrive here in frame order
+        pipeline = FramePipeline(self.predictor_path, workers=self.pipeline_workers, source=self.source,
+                                 resources=self.resources, replay_speed=self.replay_speed)
+        pipeline.start()
+        for i, process in enumerate(pipeline.processes):
+            self.resource_monitor.register_process('capture' if i == 0 else 'detector-%d' % i, process.pid)
+        try:
+            for index, frame, shape, timestamp in pipeline.results(lambda: self.running):
+                self.processFrame(frame, shape, timestamp)
+        finally:
+            pipeline.stop()
+            for i in range(self.pipeline_workers + 1):
+                self.resource_monitor.unregister('capture' if i == 0 else 'detector-%d' % i)
+
+    def processFrame(self, frame, shape, now):
+        # Alert state machine and rendering for one frame; shape is None when no face was found
+        size = frame.shape
+        color_frame = frame.copy()
+        status = {
+            "alert_level": 0,  # 0: normal, 1: mild, 2: moderate, 3: severe
+            "ear": 0,
+            "yawning": False,
+            "yawn_ratio": 0.0,
+            "message": "Normal",
+            "metrics": {},
+            "timestamp": now,  # capture time, time.monotonic()
+            "resources": self.resource_monitor.report
+        }
+        self.resource_monitor.frame(now)
+        if now >= self.next_resource_sample:
+            self.next_resource_sample = now + self.resource_interval
+            status["resources"] = self.resource_monitor.sample(now)
+
+        if shape is not None:
+            leftEye = shape[self.leStart:self.leEnd]
+            rightEye = shape[self.reStart:self.reEnd]
+            leftEyeHull = cv2.convexHull(leftEye)
+            rightEyeHull = cv2.convexHull(rightEye)
+            mouth = shape[self.mStart:self.mEnd]
+            mouthHull = cv2.convexHull(mouth)
+
+            leftEAR = self.ear(leftEye)
+            rightEAR = self.ear(rightEye)
+            self.avgEAR = (leftEAR + rightEAR) / 2.0
+            status["ear"] = self.avgEAR
+
+            eyeContourColor = (0, 255, 0)  # Default: green
+
+            yawn_ratio = self.yawn(mouth)
+            status["yawn_ratio"] = yawn_ratio
+            if yawn_ratio > 0.6:
+                status["yawning"] = True
+                self.yawn_countdown = 1
+                cv2.drawContours(color_frame, [mouthHull], -1, (0, 0, 255), 2)
+            else:
+                cv2.drawContours(color_frame, [mouthHull], -1, (0, 255, 0), 1)
+
+            if (self.driver_id is not None and self.calibrated_frames < self.calibration_frames
+                    and self.eyesOpen(status["yawning"])):
+                self.calibrate(self.avgEAR)
+
+            self.metrics.update(now, self.avgEAR < self.close_thresh, status["yawning"])
+            status["metrics"] = self.metrics.snapshot(now)
+            if self.avgEAR < self.close_thresh:
+                # Eyelid motion breaks optical flow; use the full predictor during blinks
+                self.tracker.reanchor()
+
+            if self.avgEAR < self.close_thresh:
+                self.flag += 1
+
+                if self.yawn_countdown and self.flag >= self.frame_thresh_3:
+                    eyeContourColor = (147, 20, 255)  # Purple
+                    status["alert_level"] = 3
+                    status["message"] = "Сонність (позіхання)"
+                    self.playSound(self.alert)
+                    if self.map_flag:
+                        self.map_flag = 0
+                        self.map_counter += 1
+                elif self.flag >= self.frame_thresh_2 and self.getFaceDirection(shape, size) < 0:
+                    eyeContourColor = (255, 0, 0)  # Blue
+                    status["alert_level"] = 2
+                    status["message"] = "Сонність"
+                    self.playSound(self.alert)
+                    if self.map_flag:
+                        self.map_flag = 0
+                        self.map_counter += 1
+                elif self.flag >= self.frame_thresh_1:
+                    eyeContourColor = (0, 0, 255)  # Red
+                    status["alert_level"] = 1
+                    status["message"] = "Сонність (закриті очі)"
+                    self.playSound(self.alert)
+                    if self.map_flag:
+                        self.map_flag = 0
+                        self.map_counter += 1
+            elif self.avgEAR > self.close_thresh and self.flag:
                 self.alert.stop()
+                self.yawn_countdown = 0
+                self.map_flag = 1
+                self.flag = 0
+
+            if status["alert_level"] == 0 and self.perclosExceeded(now, status["metrics"]):
+                status["alert_level"] = 1
+                status["message"] = "Сонність (PERCLOS)"
+
+            if self.map_counter >= 3:
+                self.map_flag = 1
+                self.map_counter = 0
+                self.playSound(self.sounds['break'])
+                status["message"] = "TAKE A BREAK NOW"
+
+            cv2.drawContours(color_frame, [leftEyeHull], -1, eyeContourColor, 2)
+            cv2.drawContours(color_frame, [rightEyeHull], -1, eyeContourColor, 2)
+            self.writeEyes(leftEye, rightEye, frame)
+
+        if self.avgEAR > self.close_thresh:
+            self.alert.stop()
 
-            self.update_frame.emit(color_frame)
-            self.update_status.emit(status)
+        if shape is None:
+            status["metrics"] = self.metrics.snapshot(now)
+        self.update_frame.emit(color_frame)
+        self.update_status.emit(status)
 
     def stop(self):
         self.running = False
         self.alert.stop()
         self.quit()
         self.wait()
+        self.saveProfile()
+
+    def playSound(self, player):
+        # libvlc playback threads inherit the caller's affinity and priority when created
+        with thread_settings(self.resources.get('audio')):
+            player.play()
+
+    def eyesOpen(self, yawning):
+        # Only open-eye frames go into the baseline; closures and yawns would drag the median down.
+        # Before the first estimate the fixed close_thresh may be above a narrow-eyed driver's
+        # open EAR, so only the lower clamp rejects closed eyes until then.
+        if yawning:
+            return False
+        if self.calibration.ready:
+            return self.flag == 0 and self.avgEAR >= self.close_thresh
+        return self.avgEAR >= self.calibration.min_thresh
+
+    def calibrate(self, ear):
+        self.calibration.update(ear)
+        self.calibrated_frames += 1
+        self.applyCalibration()
+        if self.calibrated_frames == self.calibration_frames:
+            self.saveProfile()
+
+    def applyCalibration(self):
+        threshold = self.calibration.threshold()
+        if threshold is not None:
+            self.close_thresh = threshold
+
+    def saveProfile(self):
+        if self.driver_id is not None and self.profiles_path and self.calibration.median.count:
+            save_profile(self.profiles_path, self.driver_id, self.calibration)
+
+    def perclosExceeded(self, now, metrics):
+        # Only trust PERCLOS once the shortest window has been fully observed
+        started = self.metrics.started
+        if started is None or now - started < self.perclos_window:
+            return False
+        return metrics[self.perclos_window]["perclos"] >= self.perclos_thresh
 
     def ear(self, eye):
         return (self.euclideanDist(eye[1], eye[5]) + self.euclideanDist(eye[2], eye[4])) / (
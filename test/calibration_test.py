@@ -0,0 +1,91 @@
+import unittest
+import os
+import random
+import tempfile
+from src.calibration import P2Quantile, EarCalibration, load_profiles, save_profile
+
+
+class TestP2Quantile(unittest.TestCase):
+    def test_tracks_quantiles_of_a_stream(self):
+        rng = random.Random(0)
+        samples = [rng.gauss(0.32, 0.03) for _ in range(20000)]
+        ordered = sorted(samples)
+
+        for p in (0.1, 0.5, 0.9):
+            estimator = P2Quantile(p)
+            for x in samples:
+                estimator.add(x)
+            self.assertAlmostEqual(estimator.value(), ordered[int(p * len(ordered))], delta=0.003)
+
+    def test_few_samples(self):
+        estimator = P2Quantile(0.5)
+        self.assertIsNone(estimator.value())
+        for x in (3, 1, 2):
+            estimator.add(x)
+        self.assertEqual(estimator.value(), 2)
+
+    def test_round_trip_continues_identically(self):
+        rng = random.Random(1)
+        original = P2Quantile(0.5)
+        for _ in range(500):
+            original.add(rng.random())
+        restored = P2Quantile.from_dict(original.to_dict())
+
+        for _ in range(500):
+            x = rng.random()
+            original.add(x)
+            restored.add(x)
+        self.assertEqual(original.value(), restored.value())
+        self.assertEqual(restored.count, 1000)
+
+
+class TestEarCalibration(unittest.TestCase):
+    def test_threshold_follows_driver_baseline(self):
+        calibration = EarCalibration(ratio=0.75, min_samples=100)
+        rng = random.Random(2)
+        for i in range(99):
+            calibration.update(rng.gauss(0.24, 0.01))
+        self.assertIsNone(calibration.threshold())
+
+        for i in range(1000):
+            # Narrow-eyed driver with occasional blinks
+            calibration.update(0.08 if i % 30 == 0 else rng.gauss(0.24, 0.01))
+        self.assertAlmostEqual(calibration.threshold(), 0.18, delta=0.005)
+
+    def test_threshold_is_clamped(self):
+        calibration = EarCalibration(min_samples=10, min_thresh=0.15, max_thresh=0.35)
+        for _ in range(10):
+            calibration.update(0.6)
+        self.assertEqual(calibration.threshold(), 0.35)
+
+    def test_profiles_persist_per_driver(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profiles', 'ear.json')
+            self.assertEqual(load_profiles(path), {})
+
+            first = EarCalibration(min_samples=10)
+            second = EarCalibration(min_samples=10)
+            for _ in range(50):
+                first.update(0.30)
+                second.update(0.22)
+            save_profile(path, 'driver-1', first)
+            save_profile(path, 'driver-2', second)
+
+            profiles = load_profiles(path)
+            self.assertEqual(set(profiles), {'driver-1', 'driver-2'})
+
+            warm = EarCalibration(min_samples=10)
+            warm.load(profiles['driver-2'])
+            self.assertTrue(warm.ready)
+            self.assertAlmostEqual(warm.threshold(), 0.75 * 0.22)
+
+    def test_corrupt_profile_file_is_ignored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ear.json')
+            with open(path, 'w') as f:
+                f.write('{broken')
+            self.assertEqual(load_profiles(path), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from src.fatigue_metrics import FatigueMetrics, SlidingWindowCounter
+
+
+class TestSlidingWindowCounter(unittest.TestCase):
+    def test_expires_old_buckets(self):
+        counter = SlidingWindowCounter(window=10, n_fields=1)
+        for t in range(20):
+            counter.add(t, [1])
+
+        # Only the last 10 one-second buckets remain
+        self.assertEqual(counter.sums(19)[0], 10)
+        self.assertEqual(counter.sums(25)[0], 4)
+        self.assertEqual(counter.sums(100)[0], 0)
+
+    def test_memory_does_not_grow_with_frames(self):
+        counter = SlidingWindowCounter(window=60, n_fields=2)
+        for i in range(10000):
+            counter.add(i / 30.0, [1, 0])
+
+        self.assertEqual(counter.buckets.shape, (60, 2))
+
+
+class TestFatigueMetrics(unittest.TestCase):
+    def feed(self, metrics, pattern, fps=10, start=0.0):
+        # pattern: sequence of (eye_closed, yawning) per frame
+        t = start
+        for closed, yawning in pattern:
+            metrics.update(t, closed, yawning)
+            t += 1.0 / fps
+        return t
+
+    def test_perclos_counts_closed_frames(self):
+        metrics = FatigueMetrics(windows=(60,))
+        self.feed(metrics, [(True, False)] * 30 + [(False, False)] * 70)
+
+        self.assertAlmostEqual(metrics.snapshot()[60]["perclos"], 0.3, places=4)
+
+    def test_blinks_and_microsleeps(self):
+        metrics = FatigueMetrics(windows=(60,), max_blink_duration=0.5)
+        blink = [(True, False)] * 2 + [(False, False)] * 8   # 0.2 s closure
+        microsleep = [(True, False)] * 20 + [(False, False)] * 10  # 2 s closure
+        self.feed(metrics, blink * 3 + microsleep)
+
+        snapshot = metrics.snapshot()[60]
+        self.assertAlmostEqual(snapshot["blink_duration"], 0.2, places=4)
+        # 3 blinks over ~6 seconds of observation
+        self.assertAlmostEqual(snapshot["blink_rate"], 3 / (5.9 / 60.0), delta=5)
+
+    def test_yawns_counted_once_per_episode(self):
+        metrics = FatigueMetrics(windows=(60,))
+        yawn = [(False, True)] * 20 + [(False, False)] * 10
+        end = self.feed(metrics, [(False, False)] * 540 + yawn * 2)
+
+        # Two yawns in a fully observed one-minute window
+        self.assertAlmostEqual(metrics.snapshot(end)[60]["yawn_rate"], 2.0, places=4)
+
+    def test_windows_are_independent(self):
+        metrics = FatigueMetrics(windows=(60, 300))
+        end = self.feed(metrics, [(True, False)] * 600, fps=10)
+        end = self.feed(metrics, [(False, False)] * 1200, fps=10, start=end)
+
+        snapshot = metrics.snapshot(end)
+        self.assertEqual(snapshot[60]["perclos"], 0.0)
+        self.assertAlmostEqual(snapshot[300]["perclos"], 1 / 3, places=2)
+
+    def test_reset_clears_state(self):
+        metrics = FatigueMetrics(windows=(60,))
+        self.feed(metrics, [(True, True)] * 10)
+        metrics.reset()
+
+        self.assertEqual(metrics.snapshot()[60]["perclos"], 0.0)
+        self.assertIsNone(metrics.started)
+
+
+if __name__ == '__main__':
+    unittest.main()
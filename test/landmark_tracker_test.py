@@ -0,0 +1,151 @@
+import unittest
+from unittest.mock import MagicMock
+import numpy as np
+import cv2
+from src.landmark_tracker import LandmarkTracker
+
+
+class FakeShape:
+    def __init__(self, points):
+        self.points = points
+        self.num_parts = len(points)
+
+    def part(self, i):
+        point = MagicMock()
+        point.x, point.y = self.points[i]
+        return point
+
+
+class FakeRect:
+    def __init__(self, left, top, right, bottom):
+        self.box = (left, top, right, bottom)
+
+    def left(self):
+        return self.box[0]
+
+    def top(self):
+        return self.box[1]
+
+    def right(self):
+        return self.box[2]
+
+    def bottom(self):
+        return self.box[3]
+
+
+def fake_predictor(points):
+    return MagicMock(side_effect=lambda gray, rect: FakeShape(points))
+
+
+def ear(eye):
+    return (np.linalg.norm(eye[1] - eye[5]) + np.linalg.norm(eye[2] - eye[4])) / (
+            2 * np.linalg.norm(eye[0] - eye[3]))
+
+
+class TestLandmarkTracker(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        noise = rng.integers(0, 255, (240, 320), dtype=np.uint8)
+        self.image = cv2.GaussianBlur(noise, (7, 7), 2)
+        self.points = np.array([[100 + (i % 17) * 6, 80 + (i // 17) * 20] for i in range(68)])
+
+    def test_interval_one_runs_predictor_every_frame(self):
+        predictor = fake_predictor(self.points)
+        tracker = LandmarkTracker(predictor, ear, interval=1)
+
+        for _ in range(5):
+            tracker.landmarks(self.image, None)
+
+        self.assertEqual(predictor.call_count, 5)
+        self.assertEqual(tracker.tracked_frames, 0)
+
+    def test_tracks_points_between_predictor_runs(self):
+        predictor = fake_predictor(self.points)
+        tracker = LandmarkTracker(predictor, ear, interval=3)
+
+        tracker.landmarks(self.image, None)
+        shifted = np.roll(self.image, (1, 2), axis=(0, 1))  # 2 px right, 1 px down
+        shape = tracker.landmarks(shifted, None)
+
+        self.assertEqual(predictor.call_count, 1)
+        self.assertEqual(tracker.tracked_frames, 1)
+        np.testing.assert_allclose(shape[tracker.tracked], self.points[tracker.tracked] + [2, 1], atol=1)
+        # Untracked points follow the mean displacement
+        np.testing.assert_allclose(shape[8], self.points[8] + [2, 1], atol=1)
+
+        # Every third frame re-anchors on the predictor
+        tracker.landmarks(shifted, None)
+        self.assertEqual(predictor.call_count, 1)
+        tracker.landmarks(shifted, None)
+        self.assertEqual(predictor.call_count, 2)
+
+    def test_reanchor_forces_full_predictor(self):
+        predictor = fake_predictor(self.points)
+        tracker = LandmarkTracker(predictor, ear, interval=10)
+
+        tracker.landmarks(self.image, None)
+        tracker.reanchor()
+        tracker.landmarks(self.image, None)
+
+        self.assertEqual(predictor.call_count, 2)
+
+    def test_reanchors_when_flow_fails(self):
+        predictor = fake_predictor(self.points)
+        tracker = LandmarkTracker(predictor, ear, interval=10)
+
+        tracker.landmarks(self.image, None)
+        tracker.landmarks(np.zeros_like(self.image), None)
+
+        self.assertEqual(predictor.call_count, 2)
+
+    def test_interval_shrinks_when_ear_drifts(self):
+        predictor = fake_predictor(self.points)
+        tracker = LandmarkTracker(predictor, ear, interval=4, ear_tolerance=0.01)
+
+        tracker.landmarks(self.image, None)
+        tracker.shape[tracker.left_eye[1]] += [0, 10]  # simulate tracking drift
+        for _ in range(4):
+            tracker.landmarks(self.image, None)
+
+        self.assertEqual(predictor.call_count, 2)
+        self.assertGreater(tracker.last_ear_error, 0.01)
+        self.assertEqual(tracker.interval, 2)
+
+    def test_interval_kept_when_flow_fails(self):
+        predictor = fake_predictor(self.points)
+        tracker = LandmarkTracker(predictor, ear, interval=4, ear_tolerance=0.01)
+
+        tracker.landmarks(self.image, None)
+        tracker.shape[tracker.left_eye[1]] += [0, 10]  # eyelid moved, as during a blink
+        tracker.landmarks(np.zeros_like(self.image), None)  # flow fails
+
+        self.assertEqual(predictor.call_count, 2)
+        self.assertEqual(tracker.last_ear_error, 0.0)
+        self.assertEqual(tracker.interval, 4)
+
+    def test_reanchors_when_points_leave_face_box(self):
+        predictor = fake_predictor(self.points)
+        tracker = LandmarkTracker(predictor, ear, interval=10)
+        face = FakeRect(90, 70, 210, 170)
+
+        tracker.landmarks(self.image, face)
+        tracker.landmarks(self.image, face)
+        self.assertEqual(predictor.call_count, 1)
+
+        # A different face somewhere else in the frame
+        tracker.landmarks(self.image, FakeRect(250, 150, 310, 230))
+        self.assertEqual(predictor.call_count, 2)
+
+    def test_reset_forces_full_predictor(self):
+        predictor = fake_predictor(self.points)
+        tracker = LandmarkTracker(predictor, ear, interval=10)
+
+        tracker.landmarks(self.image, None)
+        tracker.reset()
+        tracker.landmarks(self.image, None)
+
+        self.assertEqual(predictor.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
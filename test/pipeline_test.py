@@ -0,0 +1,153 @@
+import unittest
+import os
+import sys
+import time
+import queue
+import tempfile
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+
+# pipeline imports its sibling modules by plain name, as when run from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from src.pipeline import FramePipeline
+
+
+def brightness_landmarks(predictor_path):
+    # Predictor-free landmarker for the detector processes: every point holds the frame brightness
+    def landmarks(gray):
+        return np.full((68, 2), int(gray[0, 0]))
+    return landmarks
+
+
+class TestFramePipeline(unittest.TestCase):
+    def setUp(self):
+        self.pipeline = FramePipeline('predictor.dat', workers=2, slots=3)
+        self.pipeline.slots = [shared_memory.SharedMemory(create=True, size=4 * 4 * 3) for _ in range(3)]
+        self.pipeline.free_slots = queue.Queue()
+        self.pipeline.results_queue = queue.Queue()
+        self.pipeline.layout = queue.Queue()
+
+    def tearDown(self):
+        for slot in self.pipeline.slots:
+            slot.close()
+            slot.unlink()
+
+    def collect(self, count):
+        collected = []
+
+        def running():
+            return len(collected) < count
+
+        for index, frame, shape, timestamp in self.pipeline.results(running, timeout=0.01):
+            collected.append((index, int(frame[0, 0, 0]), shape))
+        return collected
+
+    def put_result(self, index, slot, shape=None):
+        frame = np.ndarray((4, 4, 3), dtype=np.uint8, buffer=self.pipeline.slots[slot].buf)
+        frame[:] = index
+        self.pipeline.results_queue.put((index, slot, (4, 4, 3), float(index), shape))
+
+    def test_results_are_reordered_by_frame_index(self):
+        # Workers finish out of order
+        self.put_result(2, 2)
+        self.put_result(0, 0, np.zeros((68, 2)))
+        self.put_result(1, 1)
+
+        collected = self.collect(3)
+
+        self.assertEqual([c[0] for c in collected], [0, 1, 2])
+        self.assertEqual([c[1] for c in collected], [0, 1, 2])
+        self.assertIsNotNone(collected[0][2])
+        self.assertIsNone(collected[1][2])
+
+    def test_stops_between_buffered_frames(self):
+        # Frames 1 and 2 are buffered when 0 arrives; stopping after 0 must not drain them
+        self.put_result(1, 1)
+        self.put_result(2, 2)
+        self.put_result(0, 0)
+
+        collected = []
+        for index, frame, shape, timestamp in self.pipeline.results(lambda: not collected, timeout=0.01):
+            collected.append(index)
+
+        self.assertEqual(collected, [0])
+        self.assertEqual(self.pipeline.free_slots.get_nowait(), 0)
+        self.assertTrue(self.pipeline.free_slots.empty())
+
+    def test_slots_are_released_after_consumption(self):
+        self.put_result(0, 1)
+        self.put_result(1, 0)
+
+        self.collect(2)
+
+        released = [self.pipeline.free_slots.get_nowait() for _ in range(2)]
+        self.assertEqual(released, [1, 0])
+
+    def test_waits_for_missing_index(self):
+        self.put_result(1, 1)
+
+        pending = []
+
+        def running():
+            pending.append(None)
+            return len(pending) < 5
+
+        self.assertEqual(list(self.pipeline.results(running, timeout=0.01)), [])
+        self.assertTrue(self.pipeline.free_slots.empty())
+
+    def test_dead_process_raises(self):
+        class DeadProcess:
+            name = 'detector-1'
+            exitcode = 1
+
+        self.pipeline.processes = [DeadProcess()]
+
+        with self.assertRaises(RuntimeError):
+            list(self.pipeline.results(timeout=0.01))
+        self.pipeline.processes = []
+
+    def test_stop_without_start_is_noop(self):
+        pipeline = FramePipeline('predictor.dat')
+        pipeline.stop()
+        self.assertEqual(pipeline.processes, [])
+
+
+class TestFramePipelineProcesses(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, 'drive.avi')
+        writer = cv2.VideoWriter(self.video, cv2.VideoWriter_fourcc(*'MJPG'), 30, (64, 48))
+        for i in range(20):
+            writer.write(np.full((48, 64, 3), i * 10, dtype=np.uint8))
+        writer.release()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_frames_arrive_in_order_and_stop_returns(self):
+        pipeline = FramePipeline('predictor.dat', workers=2, source=self.video,
+                                 landmarks_factory=brightness_landmarks)
+        pipeline.start()
+        collected = []
+        try:
+            # The 20-frame video replays in a loop, so indices run past its length
+            for index, frame, shape, timestamp in pipeline.results(lambda: len(collected) < 30, timeout=0.1):
+                collected.append(index)
+                self.assertEqual(frame.shape, (48, 64, 3))
+                self.assertEqual(shape.shape, (68, 2))
+            names = [slot.name for slot in pipeline.slots]
+        finally:
+            started = time.monotonic()
+            pipeline.stop()
+
+        self.assertEqual(collected, list(range(30)))
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(pipeline.processes, [])
+        for name in names:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+import unittest
+import os
+import threading
+import time
+from unittest.mock import patch
+from src.resources import ResourceMonitor, apply_thread_settings, thread_settings, HAS_AFFINITY, logger
+
+
+def in_thread(target):
+    # Run in a fresh thread so pinning never leaks into the test runner
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=target()))
+    thread.start()
+    thread.join()
+    return result.get('value')
+
+
+@unittest.skipUnless(HAS_AFFINITY and os.path.exists('/proc/self/task'), "Linux only")
+class TestThreadSettings(unittest.TestCase):
+    def test_pins_calling_thread_only(self):
+        core = min(os.sched_getaffinity(0))
+        before = os.sched_getaffinity(0)
+
+        def pin():
+            applied = apply_thread_settings({'cores': [core], 'nice': 5})
+            return applied, os.sched_getaffinity(0), os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+
+        applied, cores, nice = in_thread(pin)
+
+        self.assertTrue(applied)
+        self.assertEqual(cores, {core})
+        self.assertEqual(nice, 5)
+        self.assertEqual(os.sched_getaffinity(0), before)
+
+    def test_temporary_settings_are_restored(self):
+        core = min(os.sched_getaffinity(0))
+
+        def run():
+            before = os.sched_getaffinity(0)
+            with thread_settings({'cores': [core]}):
+                inside = os.sched_getaffinity(0)
+            return before, inside, os.sched_getaffinity(0)
+
+        before, inside, after = in_thread(run)
+
+        self.assertEqual(inside, {core})
+        self.assertEqual(after, before)
+
+    def test_nice_goes_to_new_threads_not_the_caller(self):
+        release = threading.Event()
+
+        def run():
+            tid = threading.get_native_id()
+            before = os.getpriority(os.PRIO_PROCESS, tid)
+            started = {}
+            worker = threading.Thread(target=lambda: (started.update(tid=threading.get_native_id()), release.wait()))
+            with thread_settings({'nice': 5}):
+                worker.start()
+                while 'tid' not in started:
+                    time.sleep(0.001)
+            after = os.getpriority(os.PRIO_PROCESS, tid)
+            worker_nice = os.getpriority(os.PRIO_PROCESS, started['tid'])
+            release.set()
+            worker.join()
+            return before, after, worker_nice
+
+        setpriority = os.setpriority
+
+        def unprivileged(which, who, value):
+            # Without CAP_SYS_NICE a thread can raise its nice value but never lower it
+            if value < os.getpriority(which, who):
+                raise PermissionError("Operation not permitted")
+            setpriority(which, who, value)
+
+        with patch('os.setpriority', unprivileged):
+            before, after, worker_nice = in_thread(run)
+
+        # The caller keeps its priority, so there is nothing to restore
+        self.assertEqual(after, before)
+        self.assertEqual(worker_nice, 5)
+
+    def test_refused_settings_are_logged(self):
+        def refuse(*args):
+            raise PermissionError("Operation not permitted")
+
+        def run():
+            with patch('os.setpriority', refuse), self.assertLogs(logger, level='WARNING') as logs:
+                applied = apply_thread_settings({'cores': [os.cpu_count() + 1000], 'nice': -5})
+            return applied, logs.output
+
+        applied, output = in_thread(run)
+
+        self.assertFalse(applied)
+        self.assertEqual(len(output), 2)
+        self.assertIn('cores', output[0])
+        self.assertIn('nice -5', output[1])
+
+    def test_empty_settings_are_noop(self):
+        self.assertTrue(apply_thread_settings({}))
+        self.assertTrue(apply_thread_settings(None))
+
+
+@unittest.skipUnless(os.path.exists('/proc/self/task'), "Linux only")
+class TestResourceMonitor(unittest.TestCase):
+    def test_reports_cpu_of_busy_thread(self):
+        monitor = ResourceMonitor()
+        ready = threading.Event()
+        done = threading.Event()
+
+        def busy():
+            monitor.register_thread('busy')
+            ready.set()
+            end = time.monotonic() + 0.3
+            while time.monotonic() < end:
+                pass
+            done.wait()
+
+        thread = threading.Thread(target=busy)
+        thread.start()
+        ready.wait()
+        monitor.sample(time.monotonic())
+        time.sleep(0.3)
+        report = monitor.sample(time.monotonic())
+        done.set()
+        thread.join()
+
+        self.assertGreater(report["threads"]["busy"]["cpu"], 0.3)
+        self.assertTrue(report["threads"]["busy"]["cores"])
+
+    def test_reports_unregistered_threads_by_name(self):
+        monitor = ResourceMonitor()
+        monitor.register_thread('processing')
+        ready = threading.Event()
+        done = threading.Event()
+
+        def audio():
+            # Stand-in for a libvlc or OpenCV thread the application never registers
+            with open('/proc/self/task/%d/comm' % threading.get_native_id(), 'w') as f:
+                f.write('vlc-audio')
+            ready.set()
+            end = time.monotonic() + 0.3
+            while time.monotonic() < end:
+                pass
+            done.wait()
+
+        thread = threading.Thread(target=audio)
+        monitor.sample(time.monotonic())
+        thread.start()
+        ready.wait()
+        time.sleep(0.3)
+        report = monitor.sample(time.monotonic())
+        name = 'vlc-audio-%d' % thread.native_id
+        done.set()
+        thread.join()
+
+        self.assertIn('processing', report["threads"])
+        # Registered threads are not listed a second time under their thread name
+        self.assertFalse([n for n in report["threads"] if n.endswith('-%d' % threading.get_native_id())])
+        self.assertIn(name, report["threads"])
+        self.assertGreater(report["threads"][name]["cpu"], 0.3)
+
+    def test_frame_time_and_jitter(self):
+        monitor = ResourceMonitor()
+        for t in (0.0, 0.010, 0.030, 0.040, 0.060):
+            monitor.frame(t)
+
+        report = monitor.sample(1.0)
+
+        self.assertAlmostEqual(report["frame_ms"], 15.0)
+        self.assertAlmostEqual(report["jitter_ms"], 5.0)
+        self.assertEqual(monitor.frame_count, 0)
+
+    def test_vanished_threads_are_skipped(self):
+        monitor = ResourceMonitor()
+        monitor.register_process('gone', 2 ** 22 + 12345)
+
+        self.assertNotIn('gone', monitor.sample(1.0)["threads"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+from unittest.mock import patch
+import argparse
+import io
+import os
+import re
+import sys
+import tempfile
+from contextlib import redirect_stdout
+import cv2
+import numpy as np
+
+# run_soak imports ui and its sibling modules by plain name, as when run from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from src.soak import SoakMonitor, run_soak
+
+
+class TestSoakMonitor(unittest.TestCase):
+    def setUp(self):
+        self.monitor = SoakMonitor(max_rss_growth_mb=10, max_latency_drift_ms=5, max_thread_growth=2,
+                                   warmup=60, trace=False)
+        self.monitor.start(now=0)
+
+    def sample(self, t, rss, threads, latency):
+        self.monitor.record_latency(latency)
+        return self.monitor.sample(rss_mb=rss, threads=threads, now=t)
+
+    def test_no_failures_before_baseline(self):
+        self.sample(30, 100, 10, 0.010)
+        self.sample(40, 500, 50, 1.0)
+
+        self.assertIsNone(self.monitor.baseline)
+        self.assertEqual(self.monitor.failures(), [])
+
+    def test_stable_run_passes(self):
+        for t in range(60, 600, 60):
+            self.sample(t, 100 + t / 600.0, 10, 0.010)
+
+        self.assertEqual(self.monitor.failures(), [])
+
+    def test_rss_growth_fails(self):
+        self.sample(60, 100, 10, 0.010)
+        self.sample(120, 120, 10, 0.010)
+
+        failures = self.monitor.failures()
+        self.assertEqual(len(failures), 1)
+        self.assertIn("RSS", failures[0])
+
+    def test_thread_and_latency_drift_fail(self):
+        self.sample(60, 100, 10, 0.010)
+        self.sample(120, 100, 13, 0.020)
+
+        failures = self.monitor.failures()
+        self.assertEqual(len(failures), 2)
+
+    def test_latency_is_averaged_per_interval(self):
+        self.monitor.record_latency(0.010)
+        self.monitor.record_latency(0.030)
+        sample = self.monitor.sample(rss_mb=100, threads=10, now=60)
+
+        self.assertAlmostEqual(sample["latency_ms"], 20.0)
+        self.assertAlmostEqual(sample["latency_max_ms"], 30.0)
+        self.assertEqual(sample["frames"], 2)
+        self.assertEqual(self.monitor.latency_count, 0)
+
+
+class TestRunSoak(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, 'drive.avi')
+        writer = cv2.VideoWriter(self.video, cv2.VideoWriter_fourcc(*'MJPG'), 30, (64, 48))
+        for i in range(30):
+            writer.write(np.full((48, 64, 3), i * 5, dtype=np.uint8))
+        writer.release()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @patch('vlc.MediaPlayer')
+    @patch('dlib.shape_predictor')
+    def test_replay_is_paced_to_the_video_frame_rate(self, mock_predictor, mock_media_player):
+        args = argparse.Namespace(video=self.video, speed=1.0, duration=3, interval=1, warmup=1,
+                                  restart_every=0, max_rss_growth=50.0, max_latency_drift=20.0,
+                                  max_thread_growth=4, top=5, no_tracemalloc=True)
+        output = io.StringIO()
+
+        with redirect_stdout(output):
+            code = run_soak(args)
+
+        frames = [int(f) for f in re.findall(r"frames=(\d+)", output.getvalue())]
+        self.assertEqual(code, 0, output.getvalue())
+        self.assertGreaterEqual(len(frames), 3)
+        # One second of a 30 FPS clip per sample, not as many frames as decode
+        for count in frames[1:]:
+            self.assertGreater(count, 15)
+            self.assertLess(count, 45)
+
+
+if __name__ == '__main__':
+    unittest.main()
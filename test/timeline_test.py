@@ -0,0 +1,125 @@
+import unittest
+import sys
+import numpy as np
+from PyQt6.QtWidgets import QApplication
+from src.timeline import RingBuffer, ColumnMinMax, TimelineChart
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+
+class TestRingBuffer(unittest.TestCase):
+    def test_keeps_last_samples_in_order(self):
+        buffer = RingBuffer(capacity=4, channels=1)
+        for i in range(6):
+            buffer.append([i])
+
+        np.testing.assert_array_equal(buffer.ordered()[:, 0], [2, 3, 4, 5])
+        self.assertEqual(buffer.data.shape, (4, 1))
+
+    def test_partial_and_clear(self):
+        buffer = RingBuffer(capacity=4, channels=2)
+        buffer.append([1, 2])
+        self.assertEqual(len(buffer.ordered()), 1)
+
+        buffer.clear()
+        self.assertEqual(len(buffer.ordered()), 0)
+
+
+class TestColumnMinMax(unittest.TestCase):
+    def reference(self, buffer, per_column):
+        # Brute-force min/max over the stored samples, grouped by column
+        values = buffer.ordered()
+        columns = np.arange(buffer.total - len(values), buffer.total) // per_column
+        keys = np.unique(columns)
+        return (np.array([values[columns == k].min(axis=0) for k in keys]),
+                np.array([values[columns == k].max(axis=0) for k in keys]))
+
+    def test_matches_full_reduction_while_scrolling(self):
+        rng = np.random.default_rng(1)
+        buffer = RingBuffer(capacity=50, channels=2)
+        columns = ColumnMinMax(buffer, width=8)
+        for i in range(137):
+            buffer.append(rng.random(2))
+            columns.append(buffer.data[(buffer.head - 1) % buffer.capacity])
+
+            offsets, lows, highs = columns.columns()
+            expected_lows, expected_highs = self.reference(buffer, columns.per_column)
+            np.testing.assert_array_equal(lows, expected_lows)
+            np.testing.assert_array_equal(highs, expected_highs)
+            self.assertEqual(offsets[0], 0)
+
+    def test_rebuild_matches_incremental(self):
+        rng = np.random.default_rng(2)
+        buffer = RingBuffer(capacity=40, channels=1)
+        columns = ColumnMinMax(buffer, width=10)
+        for i in range(93):
+            buffer.append(rng.random(1))
+            columns.append(buffer.data[(buffer.head - 1) % buffer.capacity])
+
+        columns.rebuild(7)
+        for i in range(11):
+            buffer.append(rng.random(1))
+            columns.append(buffer.data[(buffer.head - 1) % buffer.capacity])
+
+        offsets, lows, highs = columns.columns()
+        expected_lows, expected_highs = self.reference(buffer, columns.per_column)
+        np.testing.assert_array_equal(lows, expected_lows)
+        np.testing.assert_array_equal(highs, expected_highs)
+
+    def test_spikes_survive_decimation(self):
+        buffer = RingBuffer(capacity=1000, channels=1)
+        columns = ColumnMinMax(buffer, width=100)
+        for i in range(1000):
+            value = 0.05 if i == 501 else 0.3  # a single-frame blink
+            buffer.append([value])
+            columns.append([value])
+
+        offsets, lows, highs = columns.columns()
+
+        self.assertEqual(len(lows), 100)
+        self.assertAlmostEqual(float(lows.min()), 0.05)
+        self.assertAlmostEqual(float(highs.max()), 0.3)
+        self.assertEqual(int(np.argmin(lows[:, 0])), 50)
+
+    def test_empty(self):
+        columns = ColumnMinMax(RingBuffer(capacity=10, channels=3), width=5)
+        offsets, lows, highs = columns.columns()
+        self.assertEqual(len(offsets), 0)
+        self.assertEqual(lows.shape, (0, 3))
+
+
+class TestTimelineChart(unittest.TestCase):
+    def test_renders_full_history(self):
+        chart = TimelineChart(capacity=2000)
+        chart.resize(300, 120)
+        chart.set_threshold(0.3)
+        for i in range(5000):
+            chart.append(0.3 + 0.1 * np.sin(i / 50.0), 0.2, i % 4)
+
+        self.assertTrue(chart.dirty)
+        image = chart.grab().toImage()
+        self.assertEqual(image.width(), 300)
+
+    def test_columns_follow_widget_width(self):
+        chart = TimelineChart(capacity=1000)
+        for i in range(1500):
+            chart.append(0.3, 0.2, 0)
+        chart.resize(200, 120)
+        chart.grab()
+        self.assertEqual(chart.columns.width, 200)
+
+        chart.resize(400, 120)
+        chart.grab()
+        self.assertEqual(chart.columns.width, 400)
+        self.assertEqual(len(chart.columns.columns()[0]), 334)  # ceil(1000 / 3) columns of 3 samples
+
+    def test_refresh_clears_dirty_flag(self):
+        chart = TimelineChart(capacity=10)
+        chart.append(0.3, 0.1, 0)
+        chart.refresh()
+
+        self.assertFalse(chart.dirty)
+
+
+if __name__ == '__main__':
+    unittest.main()
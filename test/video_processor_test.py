@@ -1,8 +1,13 @@
 import unittest
 from unittest.mock import MagicMock, patch
+import os
+import sys
 import numpy as np
 import cv2
 import dlib
+
+# video_processor imports its sibling modules by plain name, as when run from src/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 from src.video_processor import VideoProcessor
 
 
@@ -180,6 +185,67 @@ class TestVideoProcessor(unittest.TestCase):
         mock_imwrite.assert_any_call(self.sound_paths['left_eye'], img[18:22, 10:16])
         mock_imwrite.assert_any_call(self.sound_paths['right_eye'], img[18:22, 30:36])
 
+    @patch('vlc.MediaPlayer')
+    @patch('dlib.shape_predictor')
+    def test_fatigue_metrics_snapshot_computed_once_per_frame(self, mock_predictor, mock_media_player):
+        # Setup
+        video_processor = VideoProcessor(self.predictor_path, self.sound_paths)
+        video_processor.update_frame = MagicMock()
+        video_processor.update_status = MagicMock()
+        video_processor.writeEyes = MagicMock()
+        video_processor.metrics.snapshot = MagicMock(return_value={60: {"perclos": 1.0}})
+        video_processor.metrics.started = 0.0
+        shape = np.array([[i % 17 * 10, i // 17 * 10 + (i % 3)] for i in range(68)])
+
+        # Test: a full PERCLOS window has been observed
+        video_processor.processFrame(np.zeros((480, 640, 3), dtype=np.uint8), shape, 120.0)
+
+        # Assert
+        video_processor.metrics.snapshot.assert_called_once_with(120.0)
+        status = video_processor.update_status.emit.call_args[0][0]
+        self.assertEqual(status["metrics"], {60: {"perclos": 1.0}})
+
+
+    @patch('vlc.MediaPlayer')
+    @patch('dlib.shape_predictor')
+    def test_calibration_uses_open_eye_frames_only(self, mock_predictor, mock_media_player):
+        # Setup
+        video_processor = VideoProcessor(self.predictor_path, self.sound_paths, driver_id='driver',
+                                         profiles_path=os.path.join(os.path.dirname(__file__), 'missing.json'))
+        video_processor.update_frame = MagicMock()
+        video_processor.update_status = MagicMock()
+        video_processor.writeEyes = MagicMock()
+        video_processor.getFaceDirection = MagicMock(return_value=1)
+        video_processor.calibrate = MagicMock()
+        video_processor.calibration = MagicMock(ready=True, min_thresh=0.15)
+        video_processor.close_thresh = 0.25
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        shape = np.zeros((68, 2), dtype=int)
+
+        # Test: (EAR, yawn ratio) per frame
+        frames = [(0.30, 0.1),  # open
+                  (0.10, 0.1),  # closed
+                  (0.28, 0.1),  # reopening frame, the closure is still in progress
+                  (0.31, 0.1),  # open
+                  (0.30, 0.8)]  # yawning
+        for ear, mouth in frames:
+            video_processor.ear = MagicMock(return_value=ear)
+            video_processor.yawn = MagicMock(return_value=mouth)
+            video_processor.processFrame(frame, shape, 0.0)
+
+        # Assert
+        self.assertEqual([c[0][0] for c in video_processor.calibrate.call_args_list], [0.30, 0.31])
+
+        # Before the first estimate a narrow-eyed driver below the default close_thresh still counts
+        video_processor.calibrate.reset_mock()
+        video_processor.calibration.ready = False
+        video_processor.close_thresh = 0.3
+        for ear in (0.22, 0.08):
+            video_processor.ear = MagicMock(return_value=ear)
+            video_processor.yawn = MagicMock(return_value=0.1)
+            video_processor.processFrame(frame, shape, 0.0)
+        self.assertEqual([c[0][0] for c in video_processor.calibrate.call_args_list], [0.22])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file